@@ -11,21 +11,34 @@ Provides the following tools:
   2. get_recording_info - get recording metadata (participants, qualities, duration)
   3. get_transcript     - fetch transcript and save as .txt file
   4. download_recording - download recording video/audio file
+  5. get_transcripts_bulk - fetch several transcripts concurrently
+  6. download_recordings_bulk - download several recording files concurrently
+  7. get_recording_bundle - get recording metadata and transcript concurrently
 
 Configuration via environment variables:
   KTALK_PROXY_URL    - proxy base URL (e.g. https://your-proxy.example.com)
   KTALK_JWT_TOKEN    - (optional) JWT override; if omitted, uses saved token from login
   KTALK_DOWNLOAD_DIR - directory for saved files (default: ./downloads)
+  KTALK_KEYCLOAK_TOKEN_URL - (optional) Keycloak token endpoint; skips discovery via the proxy
 """
 
-import json
+import asyncio
+import base64
+import functools
+import itertools
 import os
+import random
 import re
 import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator, Mapping
+from contextlib import asynccontextmanager
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
+import aiofiles
 import httpx
+import orjson
 from mcp.server.fastmcp import FastMCP
 
 # ---------------------------------------------------------------------------
@@ -35,6 +48,244 @@ from mcp.server.fastmcp import FastMCP
 DEFAULT_DOWNLOAD_DIR = "./downloads"
 TOKEN_DIR = Path.home() / ".ktalk-mcp"
 TOKEN_FILE = TOKEN_DIR / "token.json"
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+BULK_CONCURRENCY = 8
+TOKEN_REFRESH_MARGIN = 60  # seconds before expiry to refresh in the background
+TOKEN_REFRESH_MIN_DELAY = 5  # seconds; floor between background refreshes
+RETRY_ATTEMPTS = 5
+RETRY_MAX_DELAY = 30  # seconds
+MAX_IN_FLIGHT = 32  # requests sent at once on the shared client (= keep-alive pool)
+RESPONSE_CACHE_SIZE = 128
+TRANSCRIPT_THREAD_THRESHOLD = 256 * 1024  # bytes of JSON parsed in a worker thread
+TRANSCRIPT_CACHE_SIZE = 32  # finished transcripts kept parsed in memory
+
+# Zero-padded "00".."99", indexed instead of formatting with :02d.
+_PAD2 = tuple(f"{i:02d}" for i in range(100))
+_CD_FILENAME_RE = re.compile(r'filename[*]?=["\']?([^"\';\r\n]+)')
+# Recording keys and quality names are interpolated into URL paths and file
+# names, so anything outside this charset is rejected before any request.
+_PATH_SEGMENT_RE = re.compile(r"[A-Za-z0-9_-]{1,128}")
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Connection dropped mid-exchange; retried only for methods safe to repeat.
+_RETRY_ERRORS = (httpx.ReadError, httpx.RemoteProtocolError)
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+# Statuses that tools report as a message instead of raising; each entry
+# builds the message from the caller's context (used for 404).
+_ERROR_MESSAGES: dict[int, Callable[[str], str]] = {
+    401: lambda context: (
+        "Error 401: Unauthorized. "
+        "The JWT token is missing or expired. "
+        "Call the 'login' tool to re-authenticate."
+    ),
+    403: lambda context: (
+        "Error 403: Forbidden. "
+        "The JWT token does not have sufficient permissions."
+    ),
+    404: lambda context: f"Error 404: {context}",
+}
+_EXT_MAP = {
+    "video/mp4": ".mp4",
+    "video/webm": ".webm",
+    "audio/mpeg": ".mp3",
+    "audio/wav": ".wav",
+    "audio/ogg": ".ogg",
+    "application/octet-stream": ".mp4",
+}
+
+# Token-independent request headers; _auth_headers adds Authorization per token.
+# JSON bodies (transcripts especially) compress well. Their Accept-Encoding is
+# left to httpx, which advertises exactly the decoders installed (zstd and br
+# via the httpx extras); media files are already compressed.
+_BASE_HEADERS = {
+    "Accept": "application/json",
+    "User-Agent": "ktalk-mcp/1.0",
+}
+_BASE_DOWNLOAD_HEADERS = {
+    "Accept": "*/*",
+    "Accept-Encoding": "identity",
+    "User-Agent": "ktalk-mcp/1.0",
+}
+
+# ---------------------------------------------------------------------------
+# HTTP client
+# ---------------------------------------------------------------------------
+
+# Shared by all tools so keep-alive connections (and their TLS sessions)
+# survive between calls instead of being torn down after every request.
+# HTTP/2 lets concurrent calls (e.g. get_transcripts_bulk) multiplex over
+# one connection; servers without h2 fall back to HTTP/1.1 via ALPN.
+_CLIENT: httpx.AsyncClient | None = None
+# Caps requests waiting on the client so bursts of tool calls queue here
+# instead of timing out in the connection pool. Held only until response
+# headers arrive; streamed download bodies are bounded by BULK_CONCURRENCY.
+# Created with the client: a semaphore that has had waiters is bound to its
+# event loop, so it must not outlive a server restart.
+_REQUEST_SLOTS: asyncio.Semaphore | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use."""
+    global _CLIENT, _REQUEST_SLOTS
+    if _REQUEST_SLOTS is None:
+        _REQUEST_SLOTS = asyncio.Semaphore(MAX_IN_FLIGHT)
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            timeout=httpx.Timeout(60, connect=10),
+            follow_redirects=False,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=64,
+                max_keepalive_connections=32,
+                keepalive_expiry=60,
+            ),
+        )
+    return _CLIENT
+
+
+# Validators (ETag, Last-Modified) and parsed body of recently fetched JSON
+# resources, keyed by (url, params); oldest entries are evicted first.
+_RESP_CACHE: dict[tuple, tuple[str | None, str | None, Any]] = {}
+
+# Parsed transcripts (lines, speakers) keyed by (user identity, URL), least
+# recently used first. A finished transcript never changes, so repeat
+# requests by the same user skip both the download and the parsing; other
+# accounts always go through the proxy's authorization.
+_TRANSCRIPT_CACHE: dict[tuple[str, str], tuple[list[str], list[str]]] = {}
+
+
+async def _request(
+    method: str,
+    url: str,
+    *,
+    stream: bool = False,
+    follow_redirects: bool = False,
+    **kwargs: Any,
+) -> httpx.Response:
+    """Send a request on the shared client, retrying 429/5xx with backoff.
+
+    Waits for Retry-After when the server sends one, otherwise for an
+    exponentially growing delay with jitter. The last response is returned
+    as-is, so callers still see the final error status. Only GET/HEAD are
+    retried on 5xx and dropped connections (see _should_retry).
+    Redirects are followed only when asked: the JSON API answers directly,
+    while file downloads may be sent on to storage.
+    """
+    client = _get_client()
+    slots = _REQUEST_SLOTS
+    request = client.build_request(method, url, **kwargs)
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            async with slots:
+                response = await client.send(
+                    request, stream=stream, follow_redirects=follow_redirects
+                )
+        except _RETRY_ERRORS:
+            if request.method not in _IDEMPOTENT_METHODS or attempt >= RETRY_ATTEMPTS:
+                raise
+            await asyncio.sleep(_retry_delay(None, attempt))
+            continue
+        if attempt >= RETRY_ATTEMPTS or not _should_retry(request.method, response):
+            return response
+        await response.aclose()
+        await asyncio.sleep(_retry_delay(response, attempt))
+
+
+def _should_retry(method: str, response: httpx.Response) -> bool:
+    """Return whether a request may be sent again after this response.
+
+    GET/HEAD are retried on any of _RETRY_STATUSES. Other methods (the
+    Keycloak POSTs) only on a 429 carrying Retry-After, which means the
+    request was not processed: a 5xx from a gateway may come after
+    Keycloak already rotated the refresh token, and replaying the grant
+    would then fail with invalid_grant.
+    """
+    if method in _IDEMPOTENT_METHODS:
+        return response.status_code in _RETRY_STATUSES
+    return response.status_code == 429 and "retry-after" in response.headers
+
+
+def _retry_delay(response: httpx.Response | None, attempt: int) -> float:
+    """Return how long to wait before retrying after the given response."""
+    retry_after = response.headers.get("retry-after", "") if response else ""
+    if retry_after.isdigit():
+        return min(float(retry_after), RETRY_MAX_DELAY)
+    return min(2 ** (attempt - 1), RETRY_MAX_DELAY) + random.random()
+
+
+async def _get_json_conditional(
+    url: str,
+    headers: Mapping[str, str],
+    params: dict[str, str] | None = None,
+) -> tuple[httpx.Response, Any]:
+    """GET a JSON resource, revalidating a previously fetched copy.
+
+    Sends If-None-Match / If-Modified-Since when the resource was seen
+    before; on 304 the cached body is reused without downloading it again.
+    Returns the response and the parsed body (None if the request failed).
+    """
+    key = (url, tuple(sorted(params.items())) if params else ())
+    cached = _RESP_CACHE.get(key)
+    if cached:
+        etag, last_modified, _ = cached
+        headers = dict(headers)
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    response = await _request("GET", url, headers=headers, params=params)
+    if response.status_code == 304 and cached:
+        return response, cached[2]
+    if not response.is_success:
+        return response, None
+
+    data = orjson.loads(response.content)
+    etag = response.headers.get("etag")
+    last_modified = response.headers.get("last-modified")
+    _RESP_CACHE.pop(key, None)
+    if etag or last_modified:
+        _RESP_CACHE[key] = (etag, last_modified, data)
+        if len(_RESP_CACHE) > RESPONSE_CACHE_SIZE:
+            del _RESP_CACHE[next(iter(_RESP_CACHE))]
+    return response, data
+
+
+@asynccontextmanager
+async def _stream(method: str, url: str, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+    """Like _request, but leaves the body unread and closes it on exit."""
+    response = await _request(method, url, stream=True, **kwargs)
+    try:
+        yield response
+    finally:
+        await response.aclose()
+
+
+# Sessions currently inside _lifespan. The SSE and streamable-HTTP
+# transports enter the lifespan once per session, so shared state is torn
+# down only when the last one ends.
+_ACTIVE_SESSIONS = 0
+
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Stop background work and close the shared HTTP client on shutdown."""
+    global _ACTIVE_SESSIONS, _REFRESH_TASK, _CLIENT, _REQUEST_SLOTS
+    _ACTIVE_SESSIONS += 1
+    try:
+        yield
+    finally:
+        _ACTIVE_SESSIONS -= 1
+        if _ACTIVE_SESSIONS == 0:
+            if _REFRESH_TASK is not None:
+                _REFRESH_TASK.cancel()
+                _REFRESH_TASK = None
+            if _CLIENT is not None:
+                await _CLIENT.aclose()
+                _CLIENT = None
+            _REQUEST_SLOTS = None
+
 
 # ---------------------------------------------------------------------------
 # MCP server
@@ -46,6 +297,7 @@ mcp = FastMCP(
         "MCP server for KTalk: list, download and transcribe meeting recordings "
         "via proxy. Call the 'login' tool first if you get a 401 error."
     ),
+    lifespan=_lifespan,
 )
 
 # ---------------------------------------------------------------------------
@@ -53,20 +305,85 @@ mcp = FastMCP(
 # ---------------------------------------------------------------------------
 
 
+# Parsed contents of TOKEN_FILE, valid while the file's mtime is unchanged.
+_TOKEN_CACHE: dict | None = None
+_TOKEN_CACHE_MTIME: int = 0
+
+# Background task that refreshes the access token shortly before it expires.
+_REFRESH_TASK: asyncio.Task | None = None
+
+
 def _save_tokens(data: dict) -> None:
     """Persist JWT tokens to a local file."""
+    global _TOKEN_CACHE, _TOKEN_CACHE_MTIME
     TOKEN_DIR.mkdir(parents=True, exist_ok=True)
-    TOKEN_FILE.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    TOKEN_FILE.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    _TOKEN_CACHE = data
+    _TOKEN_CACHE_MTIME = TOKEN_FILE.stat().st_mtime_ns
 
 
 def _load_tokens() -> dict | None:
-    """Load JWT tokens from the local file, or return None."""
-    if not TOKEN_FILE.exists():
+    """Load JWT tokens from the local file, or return None.
+
+    The parsed file is cached in memory and only re-read when its
+    modification time changes (e.g. another process logged in).
+    """
+    global _TOKEN_CACHE, _TOKEN_CACHE_MTIME
+    try:
+        mtime = TOKEN_FILE.stat().st_mtime_ns
+    except OSError:
+        return None
+    if _TOKEN_CACHE is not None and mtime == _TOKEN_CACHE_MTIME:
+        return _TOKEN_CACHE
+    try:
+        data = orjson.loads(TOKEN_FILE.read_bytes())
+    except (orjson.JSONDecodeError, OSError):
         return None
+    _TOKEN_CACHE, _TOKEN_CACHE_MTIME = data, mtime
+    return data
+
+
+def _jwt_claims(token: str) -> dict:
+    """Return the claims of a JWT, or an empty dict if they cannot be read.
+
+    The signature is not verified; the proxy still validates the token.
+    """
     try:
-        return json.loads(TOKEN_FILE.read_text(encoding="utf-8"))
-    except (json.JSONDecodeError, OSError):
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = orjson.loads(base64.urlsafe_b64decode(payload))
+    except (IndexError, ValueError):
+        return {}
+    return claims if isinstance(claims, dict) else {}
+
+
+def _jwt_lifetime(token: str) -> float | None:
+    """Return a JWT's lifetime (``exp - iat``) in seconds, or None if unknown."""
+    claims = _jwt_claims(token)
+    exp, iat = claims.get("exp"), claims.get("iat")
+    if not isinstance(exp, (int, float)) or not isinstance(iat, (int, float)) or exp <= iat:
         return None
+    return float(exp - iat)
+
+
+def _token_identity(token: str) -> str:
+    """Return who a token belongs to: its ``sub`` claim, else the token itself.
+
+    Stable across refreshes of the same account, so per-user caches survive
+    token rotation but are never shared between accounts.
+    """
+    sub = _jwt_claims(token).get("sub")
+    return f"sub:{sub}" if isinstance(sub, str) and sub else f"token:{token}"
+
+
+def _token_expiry(access_token: str, expires_in: int) -> float:
+    """Return when the access token expires, on the local clock.
+
+    Only the lifetime is taken from the token's claims (falling back to
+    expires_in); the absolute ``exp`` is not compared with time.time(), so
+    clock skew between this host and Keycloak does not matter.
+    """
+    return time.time() + (_jwt_lifetime(access_token) or expires_in)
 
 
 # ---------------------------------------------------------------------------
@@ -74,6 +391,29 @@ def _load_tokens() -> dict | None:
 # ---------------------------------------------------------------------------
 
 
+def _reset_config_cache() -> None:
+    """Forget cached environment-derived configuration and API responses.
+
+    The config getters are cached because the environment does not change
+    while the server runs; call this after changing it (e.g. in tests).
+    Responses are dropped too, since they were fetched with the old token
+    and proxy.
+    """
+    _RESP_CACHE.clear()
+    _TRANSCRIPT_CACHE.clear()
+    _get_env_token.cache_clear()
+    _get_proxy_url.cache_clear()
+    _get_api_base.cache_clear()
+    _get_download_dir.cache_clear()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_env_token() -> str:
+    """Return the KTALK_JWT_TOKEN override, or an empty string if unset."""
+    return os.environ.get("KTALK_JWT_TOKEN", "")
+
+
+@functools.lru_cache(maxsize=1)
 def _get_proxy_url() -> str:
     """Return the proxy base URL from the environment."""
     url = os.environ.get("KTALK_PROXY_URL", "").rstrip("/")
@@ -85,6 +425,37 @@ def _get_proxy_url() -> str:
     return url
 
 
+def _schedule_refresh(expires_at: float) -> None:
+    """(Re)start the background task that refreshes the token before expiry.
+
+    Refreshing ahead of time keeps the Keycloak round-trip off the path of
+    user-facing tool calls. The delay scales with the token's remaining
+    lifetime (halfway, or TOKEN_REFRESH_MARGIN before expiry, whichever is
+    later) and is never shorter than TOKEN_REFRESH_MIN_DELAY, so short-lived
+    tokens cannot turn into a refresh loop. A token that already looks
+    expired is not scheduled; the next tool call refreshes it instead.
+    """
+    global _REFRESH_TASK
+    task = _REFRESH_TASK
+    if task is not None and task is not asyncio.current_task():
+        task.cancel()
+    _REFRESH_TASK = None
+
+    lifetime = expires_at - time.time()
+    if lifetime <= 0:
+        return
+    delay = max(lifetime * 0.5, lifetime - TOKEN_REFRESH_MARGIN, TOKEN_REFRESH_MIN_DELAY)
+    _REFRESH_TASK = asyncio.create_task(_refresh_after(delay))
+
+
+async def _refresh_after(delay: float) -> None:
+    """Sleep for delay seconds, then refresh the saved token."""
+    await asyncio.sleep(delay)
+    tokens = _load_tokens()
+    if tokens:
+        await _refresh_access_token(tokens)
+
+
 async def _refresh_access_token(tokens: dict) -> str | None:
     """Try to refresh the access token using the stored refresh_token."""
     refresh_token = tokens.get("refresh_token", "")
@@ -92,32 +463,56 @@ async def _refresh_access_token(tokens: dict) -> str | None:
     if not refresh_token or not keycloak_url:
         return None
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            resp = await client.post(keycloak_url, data={
-                "client_id": "admin-cli",
-                "grant_type": "refresh_token",
-                "refresh_token": refresh_token,
-            })
-            if resp.status_code != 200:
-                return None
-            data = resp.json()
+        resp = await _request("POST", keycloak_url, timeout=15, data={
+            "client_id": "admin-cli",
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token,
+        })
+        if resp.status_code != 200:
+            return None
+        data = orjson.loads(resp.content)
         new_access = data.get("access_token", "")
         if not new_access:
             return None
-        _save_tokens({
+        expires_at = _token_expiry(new_access, data.get("expires_in", 300))
+        await asyncio.to_thread(_save_tokens, {
             "access_token": new_access,
             "refresh_token": data.get("refresh_token", refresh_token),
-            "expires_at": time.time() + data.get("expires_in", 300),
+            "expires_at": expires_at,
             "keycloak_token_url": keycloak_url,
+            "proxy_url": tokens.get("proxy_url", ""),
         })
+        _schedule_refresh(expires_at)
         return new_access
     except Exception:
         return None
 
 
+async def _discover_token_url() -> str:
+    """Ask the proxy for its Keycloak settings and build the token endpoint URL."""
+    resp = await _request("GET", f"{_get_proxy_url()}/api/config", timeout=15)
+    resp.raise_for_status()
+    config = orjson.loads(resp.content)
+
+    keycloak_url = config["keycloak_url"].rstrip("/")
+    realm = config["keycloak_realm"]
+    return f"{keycloak_url}/realms/{realm}/protocol/openid-connect/token"
+
+
+async def _password_grant(token_url: str, username: str, password: str) -> httpx.Response:
+    """Request tokens from Keycloak with the direct access grant."""
+    return await _request("POST", token_url, timeout=15, data={
+        "client_id": "admin-cli",
+        "grant_type": "password",
+        "username": username,
+        "password": password,
+        "scope": "openid",
+    })
+
+
 def _get_jwt_token() -> str:
     """Return a valid JWT token (env var > saved file)."""
-    env_token = os.environ.get("KTALK_JWT_TOKEN", "")
+    env_token = _get_env_token()
     if env_token:
         return env_token
 
@@ -134,11 +529,13 @@ def _get_jwt_token() -> str:
     )
 
 
+@functools.lru_cache(maxsize=1)
 def _get_api_base() -> str:
     """Return the KTalk API base routed through the proxy."""
     return f"{_get_proxy_url()}/api/talk"
 
 
+@functools.lru_cache(maxsize=1)
 def _get_download_dir() -> Path:
     """Return the directory where downloaded files are saved."""
     return Path(os.environ.get("KTALK_DOWNLOAD_DIR", DEFAULT_DOWNLOAD_DIR))
@@ -146,7 +543,7 @@ def _get_download_dir() -> Path:
 
 async def _get_valid_token() -> str:
     """Return a valid JWT, attempting a refresh if the saved token is expired."""
-    env_token = os.environ.get("KTALK_JWT_TOKEN", "")
+    env_token = _get_env_token()
     if env_token:
         return env_token
 
@@ -159,6 +556,10 @@ async def _get_valid_token() -> str:
 
     expires_at = tokens.get("expires_at", 0)
     if time.time() < expires_at - 30:
+        if _REFRESH_TASK is None or _REFRESH_TASK.done():
+            # Token saved by an earlier run, or the last background refresh
+            # failed: start refreshing it in the background.
+            _schedule_refresh(expires_at)
         return tokens["access_token"]
 
     refreshed = await _refresh_access_token(tokens)
@@ -171,42 +572,60 @@ async def _get_valid_token() -> str:
     )
 
 
-async def _build_headers() -> dict[str, str]:
+async def _build_headers() -> Mapping[str, str]:
     """Build headers for JSON API requests (Bearer JWT via proxy)."""
-    return {
-        "Accept": "application/json",
-        "Accept-Encoding": "identity",
-        "User-Agent": "ktalk-mcp/1.0",
-        "Authorization": f"Bearer {await _get_valid_token()}",
-    }
+    return _auth_headers(await _get_valid_token(), download=False)
 
 
-async def _build_download_headers() -> dict[str, str]:
+async def _build_download_headers() -> Mapping[str, str]:
     """Build headers for file download requests (Bearer JWT via proxy)."""
-    return {
-        "Accept": "*/*",
-        "Accept-Encoding": "identity",
-        "User-Agent": "ktalk-mcp/1.0",
-        "Authorization": f"Bearer {await _get_valid_token()}",
-    }
-
-
-def _format_timestamp(ms: int) -> str:
-    """Format milliseconds as HH:MM:SS or MM:SS."""
-    total_seconds = ms // 1000
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    seconds = total_seconds % 60
+    return _auth_headers(await _get_valid_token(), download=True)
+
+
+@functools.lru_cache(maxsize=8)
+def _auth_headers(token: str, download: bool) -> Mapping[str, str]:
+    """Return read-only request headers for a token, built once per token."""
+    base = _BASE_DOWNLOAD_HEADERS if download else _BASE_HEADERS
+    return MappingProxyType({**base, "Authorization": f"Bearer {token}"})
+
+
+# Download directories mapped to their resolved absolute paths.
+_DIRS: dict[Path, Path] = {}
+
+
+async def _resolve_dir(path: Path) -> Path:
+    """Return the absolute path of a download directory (memoized).
+
+    resolve() hits the filesystem, so the first call for a directory runs in
+    a worker thread. The directory itself is created by the writers right
+    before each file is written, so deleting it while the server runs is
+    harmless.
+    """
+    resolved = _DIRS.get(path)
+    if resolved is None:
+        resolved = _DIRS[path] = await asyncio.to_thread(path.resolve)
+    return resolved
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_clock(total_seconds: int) -> str:
+    """Format whole seconds as HH:MM:SS or MM:SS (memoized per second).
+
+    Transcript chunks share second-resolution timestamps, so most calls
+    are cache hits.
+    """
+    hours, rem = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(rem, 60)
+    pad = _PAD2
     if hours > 0:
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-    return f"{minutes:02d}:{seconds:02d}"
+        return f"{pad[hours] if hours < 100 else hours}:{pad[minutes]}:{pad[seconds]}"
+    return f"{pad[minutes]}:{pad[seconds]}"
 
 
 def _format_duration(seconds: int) -> str:
     """Format seconds as a human-readable duration string."""
-    hours = seconds // 3600
-    minutes = (seconds % 3600) // 60
-    secs = seconds % 60
+    hours, rem = divmod(seconds, 3600)
+    minutes, secs = divmod(rem, 60)
     if hours > 0:
         return f"{hours}h {minutes}m {secs}s"
     if minutes > 0:
@@ -214,99 +633,132 @@ def _format_duration(seconds: int) -> str:
     return f"{secs}s"
 
 
-def _parse_transcript(data: Any) -> list[str]:
-    """Parse the API transcript response into a list of formatted lines."""
+def _full_name(person: dict) -> str:
+    """Join a person's firstname and surname, skipping whichever is missing."""
+    first = person.get("firstname") or ""
+    last = person.get("surname") or ""
+    return f"{first} {last}" if first and last else first or last
+
+
+def _format_phrases(items: list) -> list[str]:
+    """Format a flat list of phrase dicts (speaker name inline) as lines."""
+    clock = _format_clock
+    return [
+        f"[{clock((item.get('startTimeOffsetInMillis') or item.get('startMs') or 0) // 1000)}] "
+        f"{item.get('speakerName') or item.get('speaker') or 'Unknown'}: {item.get('text') or ''}"
+        for item in items
+    ]
+
+
+def _parse_transcript(data: Any) -> tuple[list[str], list[str], bool]:
+    """Parse the API transcript response in a single pass.
+
+    Returns the formatted lines, the sorted unique speaker names (only for
+    the track-based format) and whether the transcript is still pending
+    (status other than success/complete), in which case the only line is
+    a notice and the content will change later.
+    """
     if not data:
-        return []
+        return [], [], False
 
     # Format 1: flat list of phrases/segments
     if isinstance(data, list):
-        lines = []
-        for item in data:
-            speaker = item.get("speakerName", item.get("speaker", "Unknown"))
-            text = item.get("text", "")
-            start_ms = item.get("startTimeOffsetInMillis", item.get("startMs", 0))
-            ts = _format_timestamp(start_ms)
-            lines.append(f"[{ts}] {speaker}: {text}")
-        return lines
+        return _format_phrases(data), [], False
+    if not isinstance(data, dict):
+        return [], [], False
 
     # Format 2: object with transcription / transcriptionV2 / tracks
     transcription = data.get("transcriptionV2") or data.get("transcription") or data
+    if not isinstance(transcription, dict):
+        transcription = {}
 
-    status = transcription.get("status") if isinstance(transcription, dict) else None
+    status = transcription.get("status")
     if status and status not in ("success", "complete"):
-        return [f"Transcript unavailable (status: {status})."]
-
-    tracks = transcription.get("tracks", []) if isinstance(transcription, dict) else []
+        return [f"Transcript unavailable (status: {status})."], [], True
 
+    clock = _format_clock
     lines: list[str] = []
-    for track in tracks:
-        speaker_info = track.get("speaker", {})
-        speaker_name = (
-            speaker_info.get("anonymousName")
-            or f"{speaker_info.get('firstname', '')} {speaker_info.get('surname', '')}".strip()
-            or "Unknown"
-        )
-        for chunk in track.get("chunks", []):
-            text = chunk.get("text", "")
-            start_ms = chunk.get("startTimeOffsetInMillis", 0)
-            ts = _format_timestamp(start_ms)
-            lines.append(f"[{ts}] {speaker_name}: {text}")
+    speakers: dict[str, None] = {}  # ordered set, in order of first appearance
+    for track in transcription.get("tracks") or []:
+        # The speaker is the same for every chunk of a track.
+        speaker_info = track.get("speaker") or {}
+        name = speaker_info.get("anonymousName") or _full_name(speaker_info)
+        if name:
+            speakers[name] = None
+        speaker_name = name or "Unknown"
+        lines.extend([
+            f"[{clock((chunk.get('startTimeOffsetInMillis') or 0) // 1000)}] "
+            f"{speaker_name}: {chunk.get('text') or ''}"
+            for chunk in track.get("chunks") or []
+        ])
+    if lines:
+        return lines, sorted(speakers), False
 
     # Format 3: plain text field at the top level
-    if not lines and isinstance(data, dict) and "text" in data:
-        return [data["text"]]
+    if "text" in data:
+        return [data["text"]], sorted(speakers), False
 
     # Format 4: phrases field
-    if not lines and isinstance(data, dict):
-        phrases = data.get("phrases", [])
-        for phrase in phrases:
-            speaker = phrase.get("speakerName", phrase.get("speaker", "Unknown"))
-            text = phrase.get("text", "")
-            start_ms = phrase.get("startTimeOffsetInMillis", phrase.get("startMs", 0))
-            ts = _format_timestamp(start_ms)
-            lines.append(f"[{ts}] {speaker}: {text}")
+    return _format_phrases(data.get("phrases") or []), sorted(speakers), False
 
-    return lines
 
+def _decode_transcript(body: bytes) -> tuple[list[str], list[str], bool]:
+    """Decode a JSON transcript body into lines, speakers and pending flag."""
+    return _parse_transcript(orjson.loads(body))
 
-def _extract_speakers(data: Any) -> list[str]:
-    """Extract unique speaker names from the transcript API response."""
-    speakers: set[str] = set()
-    if not data or not isinstance(data, dict):
-        return []
 
-    transcription = data.get("transcriptionV2") or data.get("transcription") or data
-    tracks = transcription.get("tracks", []) if isinstance(transcription, dict) else []
+def _iter_info_lines(data: dict, recording_key: str) -> Iterator[str]:
+    """Yield the human-readable description of a recording, line by line."""
+    yield f"Recording: {data.get('title', 'Untitled')}"
+    yield f"Key: {recording_key}"
+    description = data.get("description")
+    if description:
+        yield f"Description: {description}"
+    yield f"Created: {data.get('createdDate', '')}"
 
-    for track in tracks:
-        speaker_info = track.get("speaker", {})
-        name = (
-            speaker_info.get("anonymousName")
-            or f"{speaker_info.get('firstname', '')} {speaker_info.get('surname', '')}".strip()
-        )
-        if name:
-            speakers.add(name)
+    created_by = data.get("createdBy", {})
+    author = _full_name(created_by)
+    author_email = created_by.get("email", "")
+    yield f"Author: {author} ({author_email})" if author_email else f"Author: {author}"
+    yield f"Duration: {_format_duration(data.get('duration', 0))}"
+    yield f"Status: {data.get('status', 'unknown')}"
+    yield f"Participants: {data.get('participantsCount', 0)}"
+
+    # Every participant yields a non-empty name, so this is empty only
+    # when there are no participants.
+    participant_names = ", ".join(
+        p.get("anonymousName") or _full_name(p.get("userInfo") or {}) or "Unknown"
+        for p in data.get("participants", [])
+    )
+    if participant_names:
+        yield f"Participant names: {participant_names}"
 
-    return sorted(speakers)
+    yield f"Audio record: {'yes' if data.get('hasAudioRecord', False) else 'no'}"
+    transcription = data.get("transcription", {})
+    yield f"Transcript: {transcription.get('status', 'none') if transcription else 'none'}"
+
+    qualities = data.get("qualities", [])
+    if not qualities:
+        yield "Available qualities: no data"
+        return
+    yield "Available qualities for download:"
+    for q in qualities:
+        size = q.get("size", {})
+        resolution = f"{size.get('width', '?')}x{size.get('height', '?')}"
+        yield f"  - {q.get('name', '?')} ({resolution}, status: {q.get('status', 'unknown')})"
+
+
+def _check_segment(value: str, what: str) -> str | None:
+    """Validate a recording key or quality name. Returns an error message or None if OK."""
+    if _PATH_SEGMENT_RE.fullmatch(value):
+        return None
+    return f"Invalid {what} '{value}'. Expected letters, digits, '_' or '-'."
 
 
 def _handle_error(response: httpx.Response, context: str) -> str | None:
     """Handle HTTP errors. Returns an error message or None if OK."""
-    if response.status_code == 401:
-        return (
-            "Error 401: Unauthorized. "
-            "The JWT token is missing or expired. "
-            "Call the 'login' tool to re-authenticate."
-        )
-    if response.status_code == 403:
-        return (
-            "Error 403: Forbidden. "
-            "The JWT token does not have sufficient permissions."
-        )
-    if response.status_code == 404:
-        return f"Error 404: {context}"
-    return None
+    builder = _ERROR_MESSAGES.get(response.status_code)
+    return builder(context) if builder else None
 
 
 # ---------------------------------------------------------------------------
@@ -330,41 +782,48 @@ async def login(username: str, password: str) -> str:
     Returns:
         Confirmation message with token expiry info.
     """
+    # Token endpoint: env override > URL saved by a previous login through
+    # the same proxy > proxy config.
     proxy_url = _get_proxy_url()
-
-    async with httpx.AsyncClient(timeout=15) as client:
-        resp = await client.get(f"{proxy_url}/api/config")
-        resp.raise_for_status()
-        config = resp.json()
-
-    keycloak_url = config["keycloak_url"].rstrip("/")
-    realm = config["keycloak_realm"]
-    token_url = f"{keycloak_url}/realms/{realm}/protocol/openid-connect/token"
-
-    async with httpx.AsyncClient(timeout=15) as client:
-        resp = await client.post(token_url, data={
-            "client_id": "admin-cli",
-            "grant_type": "password",
-            "username": username,
-            "password": password,
-            "scope": "openid",
-        })
-        if resp.status_code != 200:
-            detail = resp.json().get("error_description", resp.text)
-            return f"Login failed ({resp.status_code}): {detail}"
-        token_data = resp.json()
+    token_url = os.environ.get("KTALK_KEYCLOAK_TOKEN_URL", "")
+    from_cache = False
+    if not token_url:
+        tokens = _load_tokens()
+        if tokens and tokens.get("proxy_url") == proxy_url:
+            token_url = tokens.get("keycloak_token_url", "")
+        from_cache = bool(token_url)
+    if not token_url:
+        token_url = await _discover_token_url()
+
+    resp = await _password_grant(token_url, username, password)
+    if from_cache and resp.status_code in (401, 404):
+        # The saved endpoint may be stale (e.g. the realm moved): rediscover once.
+        fresh_url = await _discover_token_url()
+        if fresh_url != token_url:
+            token_url = fresh_url
+            resp = await _password_grant(token_url, username, password)
+    if resp.status_code != 200:
+        detail = orjson.loads(resp.content).get("error_description", resp.text)
+        return f"Login failed ({resp.status_code}): {detail}"
+    token_data = orjson.loads(resp.content)
 
     access_token = token_data.get("access_token", "")
     if not access_token:
         return "Login failed: Keycloak returned no access_token."
 
     expires_in = token_data.get("expires_in", 300)
-    _save_tokens({
+    expires_at = _token_expiry(access_token, expires_in)
+    await asyncio.to_thread(_save_tokens, {
         "access_token": access_token,
         "refresh_token": token_data.get("refresh_token", ""),
-        "expires_at": time.time() + expires_in,
+        "expires_at": expires_at,
         "keycloak_token_url": token_url,
+        "proxy_url": proxy_url,
     })
+    _schedule_refresh(expires_at)
+    # Possibly another account now: drop responses fetched for the old one.
+    _RESP_CACHE.clear()
+    _TRANSCRIPT_CACHE.clear()
 
     return (
         f"Authenticated as {username}.\n"
@@ -404,15 +863,14 @@ async def list_recordings(
 
     headers = await _build_headers()
 
-    async with httpx.AsyncClient(timeout=60, follow_redirects=True) as client:
-        response = await client.get(url, headers=headers, params=params)
+    response, data = await _get_json_conditional(url, headers, params)
 
-        error = _handle_error(response, "Recordings endpoint not available.")
-        if error:
-            return error
+    error = _handle_error(response, "Recordings endpoint not available.")
+    if error:
+        return error
 
+    if data is None:
         response.raise_for_status()
-        data = response.json()
 
     recordings = data if isinstance(data, list) else data.get("recordings", data.get("items", []))
 
@@ -457,53 +915,8 @@ async def get_transcript(
     Returns:
         Summary with the saved file path and basic stats.
     """
-    url = f"{_get_api_base()}/api/recordings/{recording_key}/transcript"
-    headers = await _build_headers()
-    download_dir = Path(output_dir) if output_dir else _get_download_dir()
-    download_dir.mkdir(parents=True, exist_ok=True)
-
-    async with httpx.AsyncClient(timeout=60, follow_redirects=True) as client:
-        response = await client.get(url, headers=headers)
-
-        error = _handle_error(
-            response,
-            f"Recording '{recording_key}' not found.",
-        )
-        if error:
-            return error
-
-        response.raise_for_status()
-
-        content_type = response.headers.get("content-type", "")
-        if "application/json" in content_type:
-            data = response.json()
-            lines = _parse_transcript(data)
-            speakers = _extract_speakers(data)
-        else:
-            lines = [response.text]
-            speakers = []
-
-    if not lines:
-        return f"Transcript for recording '{recording_key}' is empty."
-
-    transcript_text = "\n".join(lines)
-
-    # Save to file
-    filename = f"{recording_key}_transcript.txt"
-    file_path = download_dir / filename
-    file_path.write_text(transcript_text, encoding="utf-8")
-
-    # Build summary
-    summary_parts = [
-        "Transcript saved:",
-        f"  Path: {file_path.resolve()}",
-        f"  Recording key: {recording_key}",
-        f"  Lines: {len(lines)}",
-    ]
-    if speakers:
-        summary_parts.append(f"  Speakers: {', '.join(speakers)}")
-
-    return "\n".join(summary_parts)
+    download_dir = await _resolve_dir(Path(output_dir) if output_dir else _get_download_dir())
+    return await _fetch_transcript(recording_key, download_dir)
 
 
 # ---------------------------------------------------------------------------
@@ -518,7 +931,7 @@ async def download_recording(
 ) -> str:
     """Download a KTalk meeting recording file.
 
-    Downloads the file via the proxy and saves it to disk.
+    Streams the file via the proxy straight to disk.
     Use get_recording_info first to see available qualities.
 
     Args:
@@ -530,37 +943,8 @@ async def download_recording(
     Returns:
         Summary with the saved file path and size, or an error message.
     """
-    url = f"{_get_api_base()}/api/Recordings/{recording_key}/file/{quality_name}"
-    headers = await _build_download_headers()
-    download_dir = Path(output_dir) if output_dir else _get_download_dir()
-    download_dir.mkdir(parents=True, exist_ok=True)
-
-    async with httpx.AsyncClient(timeout=300, follow_redirects=True) as client:
-        response = await client.get(url, headers=headers)
-
-        error = _handle_error(
-            response,
-            f"Recording file '{recording_key}' with quality '{quality_name}' not found. "
-            f"Use get_recording_info to see available qualities.",
-        )
-        if error:
-            return error
-
-        response.raise_for_status()
-
-        filename = _extract_filename(response, recording_key, quality_name)
-        file_path = download_dir / filename
-
-        file_path.write_bytes(response.content)
-
-        size_mb = len(response.content) / (1024 * 1024)
-        return (
-            f"Recording file saved:\n"
-            f"  Path: {file_path.resolve()}\n"
-            f"  Size: {size_mb:.1f} MB\n"
-            f"  Recording key: {recording_key}\n"
-            f"  Quality: {quality_name}"
-        )
+    download_dir = await _resolve_dir(Path(output_dir) if output_dir else _get_download_dir())
+    return await _download_file(recording_key, quality_name, download_dir)
 
 
 # ---------------------------------------------------------------------------
@@ -582,11 +966,197 @@ async def get_recording_info(
     Returns:
         Recording information in a human-readable text format.
     """
+    return await _fetch_recording_info(recording_key)
+
+
+# ---------------------------------------------------------------------------
+# Tool 5: Get transcripts in bulk
+# ---------------------------------------------------------------------------
+
+@mcp.tool()
+async def get_transcripts_bulk(
+    recording_keys: list[str],
+    output_dir: str | None = None,
+) -> str:
+    """Download transcripts of several KTalk recordings concurrently.
+
+    Works like get_transcript for every key, but runs the requests in
+    parallel (at most 8 at a time) instead of one by one.
+
+    Args:
+        recording_keys: Recording keys (e.g. ["Y3ljMA8KGS72A68L0jp0", ...]).
+        output_dir: Directory to save the files. Falls back to KTALK_DOWNLOAD_DIR env var.
+
+    Returns:
+        One summary block per recording, in the order of recording_keys.
+    """
+    if not recording_keys:
+        return "No recording keys given."
+
+    download_dir = await _resolve_dir(Path(output_dir) if output_dir else _get_download_dir())
+    return await _gather_bounded(
+        recording_keys,
+        lambda key: _fetch_transcript(key, download_dir),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Tool 6: Download recording files in bulk
+# ---------------------------------------------------------------------------
+
+@mcp.tool()
+async def download_recordings_bulk(
+    recording_keys: list[str],
+    quality_name: str = "240p",
+    output_dir: str | None = None,
+) -> str:
+    """Download files of several KTalk recordings concurrently.
+
+    Works like download_recording for every key, but runs the downloads in
+    parallel (at most 8 at a time) instead of one by one.
+
+    Args:
+        recording_keys: Recording keys (e.g. ["Y3ljMA8KGS72A68L0jp0", ...]).
+        quality_name: Video quality for all files (e.g. "240p", "720p"). Defaults to "240p".
+        output_dir: Directory to save the files. Falls back to KTALK_DOWNLOAD_DIR env var.
+
+    Returns:
+        One summary block per recording, in the order of recording_keys.
+    """
+    if not recording_keys:
+        return "No recording keys given."
+
+    download_dir = await _resolve_dir(Path(output_dir) if output_dir else _get_download_dir())
+    return await _gather_bounded(
+        recording_keys,
+        lambda key: _download_file(key, quality_name, download_dir),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Tool 7: Get recording info and transcript together
+# ---------------------------------------------------------------------------
+
+@mcp.tool()
+async def get_recording_bundle(
+    recording_key: str,
+    output_dir: str | None = None,
+) -> str:
+    """Get recording metadata and save its transcript in one call.
+
+    Equivalent to get_recording_info followed by get_transcript, but both
+    requests are sent concurrently.
+
+    Args:
+        recording_key: Recording key (e.g. "Y3ljMA8KGS72A68L0jp0").
+        output_dir: Directory to save the transcript. Falls back to KTALK_DOWNLOAD_DIR env var.
+
+    Returns:
+        Recording information followed by the transcript summary.
+    """
+    error = _check_segment(recording_key, "recording key")
+    if error:
+        return error
+
+    download_dir = await _resolve_dir(Path(output_dir) if output_dir else _get_download_dir())
+    # return_exceptions: a failure in one half must not leave the other
+    # running unobserved; each half reports its own error instead.
+    results = await asyncio.gather(
+        _fetch_recording_info(recording_key),
+        _fetch_transcript(recording_key, download_dir),
+        return_exceptions=True,
+    )
+    return "\n\n".join(
+        f"Error for recording '{recording_key}': {result}"
+        if isinstance(result, BaseException) else result
+        for result in results
+    )
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+async def _gather_bounded(
+    keys: list[str],
+    fetch: Callable[[str], Awaitable[str]],
+) -> str:
+    """Run fetch(key) for all keys, at most BULK_CONCURRENCY at a time.
+
+    Returns the per-key summaries joined by blank lines, in input order;
+    an exception for one key is reported in its block.
+    """
+    sem = asyncio.Semaphore(BULK_CONCURRENCY)
+
+    async def one(key: str) -> str:
+        async with sem:
+            return await fetch(key)
+
+    results = await asyncio.gather(
+        *(one(key) for key in keys),
+        return_exceptions=True,
+    )
+
+    blocks = []
+    for key, result in zip(keys, results):
+        if isinstance(result, BaseException):
+            result = f"Error for recording '{key}': {result}"
+        blocks.append(result)
+    return "\n\n".join(blocks)
+
+
+async def _fetch_recording_info(recording_key: str) -> str:
+    """Fetch recording metadata and format it as human-readable text."""
+    error = _check_segment(recording_key, "recording key")
+    if error:
+        return error
+
     url = f"{_get_api_base()}/api/Recordings/{recording_key}"
     headers = await _build_headers()
 
-    async with httpx.AsyncClient(timeout=60, follow_redirects=True) as client:
-        response = await client.get(url, headers=headers)
+    response, data = await _get_json_conditional(url, headers)
+
+    error = _handle_error(
+        response,
+        f"Recording '{recording_key}' not found.",
+    )
+    if error:
+        return error
+
+    if data is None:
+        response.raise_for_status()
+
+    return "\n".join(_iter_info_lines(data, recording_key))
+
+
+def _write_lines(path: Path, lines: list[str]) -> None:
+    """Write newline-separated lines without joining them into one string first."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        f.write(lines[0])
+        f.writelines("\n" + line for line in itertools.islice(lines, 1, None))
+
+
+async def _fetch_transcript(recording_key: str, download_dir: Path) -> str:
+    """Fetch a transcript, save it to download_dir and return a summary."""
+    error = _check_segment(recording_key, "recording key")
+    if error:
+        return error
+
+    url = f"{_get_api_base()}/api/recordings/{recording_key}/transcript"
+
+    # Get the token even on a cache hit: entries are per user, and a missing
+    # or expired token must fail exactly as an uncached call would.
+    token = await _get_valid_token()
+    headers = _auth_headers(token, download=False)
+    cache_key = (_token_identity(token), url)
+
+    cached = _TRANSCRIPT_CACHE.pop(cache_key, None)
+    cacheable = cached is not None
+    if cached:
+        lines, speakers = cached
+    else:
+        response = await _request("GET", url, headers=headers)
 
         error = _handle_error(
             response,
@@ -596,97 +1166,174 @@ async def get_recording_info(
             return error
 
         response.raise_for_status()
-        data = response.json()
 
-    title = data.get("title", "Untitled")
-    description = data.get("description") or ""
-    created = data.get("createdDate", "")
-    duration = data.get("duration", 0)
-    status = data.get("status", "unknown")
-    participants_count = data.get("participantsCount", 0)
+        body = response.content
+        try:
+            if len(body) > TRANSCRIPT_THREAD_THRESHOLD:
+                # Long meetings: keep decoding and formatting off the event loop.
+                lines, speakers, pending = await asyncio.to_thread(_decode_transcript, body)
+            else:
+                lines, speakers, pending = _decode_transcript(body)
+            # A transcript still being processed will change; don't pin it.
+            cacheable = bool(lines) and not pending
+        except orjson.JSONDecodeError:
+            # Plain-text transcript (whatever the Content-Type says): save as is.
+            lines = [response.text]
+            speakers = []
 
-    # Author
-    created_by = data.get("createdBy", {})
-    author = f"{created_by.get('firstname', '')} {created_by.get('surname', '')}".strip()
-    author_email = created_by.get("email", "")
+    if cacheable:
+        # (Re)insert at the end so the least recently used entry goes first.
+        _TRANSCRIPT_CACHE[cache_key] = (lines, speakers)
+        if len(_TRANSCRIPT_CACHE) > TRANSCRIPT_CACHE_SIZE:
+            del _TRANSCRIPT_CACHE[next(iter(_TRANSCRIPT_CACHE))]
 
-    # Participants
-    participants = data.get("participants", [])
-    participant_names = []
-    for p in participants:
-        user = p.get("userInfo") or {}
-        name = (
-            p.get("anonymousName")
-            or f"{user.get('firstname', '')} {user.get('surname', '')}".strip()
-            or "Unknown"
-        )
-        participant_names.append(name)
+    if not lines:
+        return f"Transcript for recording '{recording_key}' is empty."
 
-    # Available qualities
-    qualities = data.get("qualities", [])
-    quality_lines = []
-    for q in qualities:
-        q_name = q.get("name", "?")
-        q_status = q.get("status", "unknown")
-        size = q.get("size", {})
-        resolution = f"{size.get('width', '?')}x{size.get('height', '?')}"
-        quality_lines.append(f"  - {q_name} ({resolution}, status: {q_status})")
+    # Save to file
+    filename = f"{recording_key}_transcript.txt"
+    file_path = download_dir / filename
+    await asyncio.to_thread(_write_lines, file_path, lines)
 
-    # Transcript status
-    transcription = data.get("transcription", {})
-    tr_status = transcription.get("status", "none") if transcription else "none"
+    # Build summary
+    summary_parts = [
+        "Transcript saved:",
+        f"  Path: {file_path}",
+        f"  Recording key: {recording_key}",
+        f"  Lines: {len(lines)}",
+    ]
+    if speakers:
+        summary_parts.append(f"  Speakers: {', '.join(speakers)}")
 
-    has_audio = data.get("hasAudioRecord", False)
+    return "\n".join(summary_parts)
 
-    # Build output
-    lines = [
-        f"Recording: {title}",
-        f"Key: {recording_key}",
-    ]
-    if description:
-        lines.append(f"Description: {description}")
-    lines.extend([
-        f"Created: {created}",
-        f"Author: {author} ({author_email})" if author_email else f"Author: {author}",
-        f"Duration: {_format_duration(duration)}",
-        f"Status: {status}",
-        f"Participants: {participants_count}",
-    ])
-    if participant_names:
-        lines.append(f"Participant names: {', '.join(participant_names)}")
-    lines.append(f"Audio record: {'yes' if has_audio else 'no'}")
-    lines.append(f"Transcript: {tr_status}")
-    if quality_lines:
-        lines.append("Available qualities for download:")
-        lines.extend(quality_lines)
-    else:
-        lines.append("Available qualities: no data")
 
-    return "\n".join(lines)
+async def _download_file(recording_key: str, quality_name: str, download_dir: Path) -> str:
+    """Stream a recording file into download_dir and return a summary."""
+    error = (
+        _check_segment(recording_key, "recording key")
+        or _check_segment(quality_name, "quality name")
+    )
+    if error:
+        return error
 
+    url = f"{_get_api_base()}/api/Recordings/{recording_key}/file/{quality_name}"
+    headers = await _build_download_headers()
+
+    not_found = (
+        f"Recording file '{recording_key}' with quality '{quality_name}' not found. "
+        f"Use get_recording_info to see available qualities."
+    )
+
+    # Probe with HEAD so a wrong key or quality fails fast, before the media
+    # stream starts. Proxies that do not allow HEAD go straight to the GET.
+    # Only the proxy is asked: a redirect already proves the file exists,
+    # and storage URLs presigned for GET often reject HEAD with 403.
+    head = await _request("HEAD", url, headers=headers)
+    if head.status_code not in (405, 501):
+        error = _handle_error(head, not_found)
+        if error:
+            return error
+
+    async with _stream(
+        "GET", url, headers=headers, timeout=300, follow_redirects=True
+    ) as response:
+        error = _handle_error(response, not_found)
+        if error:
+            return error
+
+        response.raise_for_status()
+
+        filename = _extract_filename(response, recording_key, quality_name)
+        file_path = download_dir / filename
+        part_path = file_path.with_name(file_path.name + ".part")
+
+        # Write chunks as they arrive so memory use does not grow with file
+        # size. The data goes to a .part file that replaces the target only
+        # once complete, so an interrupted download never leaves a truncated
+        # file under the final name.
+        content_length = response.headers.get("content-length", "")
+        expected = int(content_length) if content_length.isdigit() else 0
+        # Media is requested with Accept-Encoding: identity, so the raw stream
+        # already is the file and the decoder layer can be skipped. Decode
+        # only if the server compressed it anyway.
+        if response.headers.get("content-encoding", "identity") == "identity":
+            chunks = response.aiter_raw(DOWNLOAD_CHUNK_SIZE)
+        else:
+            chunks = response.aiter_bytes(DOWNLOAD_CHUNK_SIZE)
+        total = 0
+        try:
+            await asyncio.to_thread(part_path.parent.mkdir, parents=True, exist_ok=True)
+            async with aiofiles.open(part_path, "wb") as f:
+                if expected:
+                    await asyncio.to_thread(_preallocate, f.fileno(), expected)
+                async for chunk in chunks:
+                    await f.write(chunk)
+                    total += len(chunk)
+                if total != expected:
+                    await f.truncate(total)
+                await f.flush()
+                await asyncio.to_thread(_drop_page_cache, f.fileno())
+            await asyncio.to_thread(os.replace, part_path, file_path)
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
+
+    size_mb = total / (1024 * 1024)
+    return (
+        f"Recording file saved:\n"
+        f"  Path: {file_path}\n"
+        f"  Size: {size_mb:.1f} MB\n"
+        f"  Recording key: {recording_key}\n"
+        f"  Quality: {quality_name}"
+    )
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Reserve disk space for a download of known size up front.
+
+    Lets the filesystem lay the file out in few large extents instead of
+    growing it chunk by chunk. Best effort: skipped where posix_fallocate is
+    unavailable (macOS, Windows) or unsupported by the filesystem.
+    """
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+        except OSError:
+            pass
+
+
+def _drop_page_cache(fd: int) -> None:
+    """Hint that a just-written file will not be read back soon.
+
+    Keeps a large recording from evicting hotter pages from the page cache.
+    On Linux this also starts writeback of the dirty pages without waiting
+    for it. A no-op where posix_fadvise is unavailable (macOS, Windows) or
+    rejected by the filesystem.
+    """
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
 
-# ---------------------------------------------------------------------------
-# Helpers
-# ---------------------------------------------------------------------------
 
 def _extract_filename(response: httpx.Response, recording_key: str, quality_name: str) -> str:
-    """Extract filename from Content-Disposition header or generate one."""
+    """Extract filename from Content-Disposition header or generate one.
+
+    Only the last path component of the header's filename is used, so the
+    server cannot place the file outside the download directory.
+    """
     cd = response.headers.get("content-disposition", "")
     if cd:
-        match = re.search(r'filename[*]?=["\']?([^"\';\r\n]+)', cd)
+        match = _CD_FILENAME_RE.search(cd)
         if match:
-            return match.group(1).strip()
+            name = Path(match.group(1).strip()).name
+            if name not in ("", ".", ".."):
+                return name
 
     content_type = response.headers.get("content-type", "")
-    ext_map = {
-        "video/mp4": ".mp4",
-        "video/webm": ".webm",
-        "audio/mpeg": ".mp3",
-        "audio/wav": ".wav",
-        "audio/ogg": ".ogg",
-        "application/octet-stream": ".mp4",
-    }
-    ext = ext_map.get(content_type.split(";")[0].strip(), ".mp4")
+    ext = _EXT_MAP.get(content_type.partition(";")[0].strip(), ".mp4")
     return f"{recording_key}_{quality_name}{ext}"
 
 
@@ -695,4 +1342,15 @@ def _extract_filename(response: httpx.Response, recording_key: str, quality_name
 # ---------------------------------------------------------------------------
 
 if __name__ == "__main__":
-    mcp.run()
+    # uvloop cuts per-socket-operation overhead of the event loop; it is not
+    # available on Windows, where mcp.run() uses the default asyncio loop.
+    # The loop is requested from anyio directly (as mcp.run() would start the
+    # stdio transport) rather than through the deprecated uvloop.install().
+    try:
+        import uvloop
+    except ImportError:
+        mcp.run()
+    else:
+        import anyio
+
+        anyio.run(mcp.run_stdio_async, backend_options={"use_uvloop": True})